@@ -7,9 +7,23 @@ from time import time
 GROUP_API = "groups.roblox.com"
 GROUP_API_ADDR = (__import__("socket").gethostbyname(GROUP_API), 443)
 
+# Static request framing, built once instead of per send.
+BATCH_REQUEST_HEAD = b"GET /v2/groups?groupIds="
+BATCH_REQUEST_TAIL = (
+    b" HTTP/1.1\n"
+    b"Host:groups.roblox.com\n"
+    b"Accept-Encoding:deflate\n"
+    b"\n")
+DETAIL_REQUEST_HEAD = b"GET /v1/groups/"
+DETAIL_REQUEST_TAIL = (
+    b" HTTP/1.1\n"
+    b"Host:groups.roblox.com\n"
+    b"\n")
+
 def group_scanner(log_queue, count_queue, proxy_iter, timeout,
                   gid_ranges, gid_cutoff, gid_chunk_size):
     gid_tracked = set()
+    gid_dropped = set()
     gid_list = [
         str(gid).encode()
         for gid_range in gid_ranges
@@ -17,6 +31,15 @@ def group_scanner(log_queue, count_queue, proxy_iter, timeout,
     gid_list_len = len(gid_list)
     gid_list_idx = 0
 
+    def drop_gid(gid):
+        # list.remove is O(n) on a list of millions, so removed IDs are
+        # only marked here; chunk building skips them and compaction
+        # sweeps them out of the list periodically.
+        nonlocal gid_list_len
+        if gid not in gid_dropped:
+            gid_dropped.add(gid)
+            gid_list_len -= 1
+
     if gid_cutoff:
         gid_cutoff = str(gid_cutoff).encode()
 
@@ -33,22 +56,33 @@ def group_scanner(log_queue, count_queue, proxy_iter, timeout,
             continue
         
         while True:
-            gid_chunk = [
-                gid_list[(gid_list_idx + n) % gid_list_len]
-                for n in range(1, gid_chunk_size + 1)]
-            gid_list_idx += gid_chunk_size
+            if len(gid_dropped) * 8 > len(gid_list):
+                # Sweep dropped IDs out once they make up over an eighth
+                # of the list.
+                gid_list = [gid for gid in gid_list if gid not in gid_dropped]
+                gid_dropped.clear()
+                gid_list_idx %= len(gid_list)
+
+            gid_chunk = []
+            cur_list_len = len(gid_list)
+            while len(gid_chunk) < gid_chunk_size:
+                gid = gid_list[gid_list_idx % cur_list_len]
+                gid_list_idx += 1
+                if gid not in gid_dropped:
+                    gid_chunk.append(gid)
 
             try:
                 # Request batch group details.
                 sock.send(
-                    b"GET /v2/groups?groupIds=" + b",".join(gid_chunk) + b" HTTP/1.1\n"
-                    b"Host:groups.roblox.com\n"
-                    b"Accept-Encoding:deflate\n"
-                    b"\n")
+                    BATCH_REQUEST_HEAD
+                    + b",".join(gid_chunk)
+                    + BATCH_REQUEST_TAIL)
                 resp = sock.recv(1048576)
                 if resp[:12] != b"HTTP/1.1 200":
                     break
-                resp = resp[resp.find(b"\r\n\r\n") + 4:]
+                # Accumulate into a bytearray so each extra recv extends
+                # the buffer in-place instead of copying the whole response.
+                resp = bytearray(resp[resp.find(b"\r\n\r\n") + 4:])
                 while resp[-1] != 0:
                     resp += sock.recv(1048576)
                 owner_status = parse_batch_response(
@@ -60,8 +94,7 @@ def group_scanner(log_queue, count_queue, proxy_iter, timeout,
                         if not gid_cutoff or gid_cutoff > gid:
                             # Group is outside of cut-off range.
                             # Assume it doesn't exist and ignore it in the future.
-                            gid_list.remove(gid)
-                            gid_list_len -= 1
+                            drop_gid(gid)
                         continue
                     
                     if gid not in gid_tracked:
@@ -72,8 +105,7 @@ def group_scanner(log_queue, count_queue, proxy_iter, timeout,
                         else:
                             # Group doesn't have an owner, and this is only the first time it's been checked.
                             # Assume that it's locked or manual-approval only, and ignore it in the future.
-                            gid_list.remove(gid)
-                            gid_list_len -= 1
+                            drop_gid(gid)
                         continue
 
                     if owner_status[gid]:
@@ -84,9 +116,7 @@ def group_scanner(log_queue, count_queue, proxy_iter, timeout,
                     # Group is marked as tracked and doesn't have an owner.
                     # Request extra details and determine if it's claimable.
                     sock.send(
-                        b"GET /v1/groups/" + gid + b" HTTP/1.1\n"
-                        b"Host:groups.roblox.com\n"
-                        b"\n")
+                        DETAIL_REQUEST_HEAD + gid + DETAIL_REQUEST_TAIL)
                     resp = sock.recv(1048576)
                     if not resp.startswith(b"HTTP/1.1 200 OK"):
                         break
@@ -96,16 +126,14 @@ def group_scanner(log_queue, count_queue, proxy_iter, timeout,
                         or group_info["owner"]
                         or "isLocked" in group_info):
                         # Group cannot be claimed, ignore it in the future.
-                        gid_list.remove(gid)
-                        gid_list_len -= 1
+                        drop_gid(gid)
                         continue
                     
                     # Send group info back to main process.
                     log_queue.put((datetime.now(timezone.utc), group_info))
                     
                     # Ignore group in the future.
-                    gid_list.remove(gid)
-                    gid_list_len -= 1
+                    drop_gid(gid)
 
                 # Let the counter know <gid_chunk_size> groups were checked.
                 count_queue.put((time(), gid_chunk_size))
@@ -1,17 +1,28 @@
-from time import time, sleep
+from queue import Empty
+from time import time
 
 def stat_updater(count_queue):
     count_cache = {}
+    last_line = None
 
     while True:
+        # Block until a batch arrives instead of polling on a fixed sleep,
+        # then drain whatever else is queued without blocking.
+        try:
+            chunks = [count_queue.get(timeout=0.10)]
+        except Empty:
+            chunks = []
         while True:
             try:
-                for ts, count in count_queue.get(block=False):
-                    ts = int(ts)
-                    count_cache[ts] = count_cache.get(ts, 0) + count
-            except:
+                chunks.append(count_queue.get(block=False))
+            except Empty:
                 break
-            
+
+        for chunk in chunks:
+            for ts, count in chunk:
+                ts = int(ts)
+                count_cache[ts] = count_cache.get(ts, 0) + count
+
         now = time()
         total_count = 0
         for ts, count in tuple(count_cache.items()):
@@ -19,6 +30,10 @@ def stat_updater(count_queue):
                 count_cache.pop(ts)
                 continue
             total_count += count
-        
-        print(f"Speed: {total_count/1e6:.2f}m RPM", end="\r")
-        sleep(0.10)
\ No newline at end of file
+
+        # Console writes are slow (and locked), so only redraw the line
+        # when the displayed value actually changed.
+        line = f"Speed: {total_count/1e6:.2f}m RPM"
+        if line != last_line:
+            print(line, end="\r")
+            last_line = line